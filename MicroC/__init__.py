@@ -1,18 +1,65 @@
 from .node import *
+from .analysis import prune_unreachable
+from .program import CompiledProgram, GlobalState
 
-def eval(source):
+def eval(source, stats=None, lazy=False, engine="python"):
     from .parser import parse_source
     from .transformer import MicroCTransformer
+    from .stats import phase
 
-    tree = parse_source(source)
+    with phase(stats, "parse"):
+        tree = parse_source(source)
     if not tree:
-        raise Exception("erro na sintaxe")
-    
-    ast = MicroCTransformer().transform(tree)
+        raise ParseError("erro na sintaxe")
 
-    interpreter = Interpreter(ast)
+    with phase(stats, "transform"):
+        if lazy:
+            # só main e o que ela (ou as globais) alcança é mantido, e cada
+            # função é convertida na primeira chamada
+            ast = prune_unreachable(MicroCTransformer().transform_lazy(tree))
+        else:
+            ast = MicroCTransformer().transform(tree)
+    if stats is not None:
+        stats.record_program(ast)
 
-    result = interpreter.visit_program(ast)
+    with phase(stats, "load"):
+        native = None
+        if engine == "native":
+            # sem compilador C, ou se o programa não puder ser traduzido,
+            # o interpretador é usado
+            from . import native as backend
+            native = backend.load(ast)
+        if native is None:
+            interpreter = Interpreter(ast)
+
+    with phase(stats, "execute"):
+        if native is not None:
+            result = backend.run(native)
+        else:
+            result = interpreter.visit_program(ast)
 
     print(result)
-    return result
\ No newline at end of file
+    return result
+
+def compile(source, out=None, lazy=False, roots=None):
+    """
+    Faz o parse e a transformação de `source` uma única vez e devolve um
+    CompiledProgram reutilizável. Erros de sintaxe levantam ParseError.
+    `out` recebe o que for impresso durante a inicialização das globais;
+    por padrão essa saída é descartada.
+
+    Com `lazy`, o corpo de cada função só é convertido para ast na primeira
+    chamada. Com `roots` (nomes de funções), as funções que não são
+    alcançáveis a partir delas são descartadas.
+    """
+    from .parser import parse
+    from .transformer import MicroCTransformer
+
+    tree = parse(source)
+    if lazy:
+        ast = MicroCTransformer().transform_lazy(tree)
+    else:
+        ast = MicroCTransformer().transform(tree)
+    if roots is not None:
+        ast = prune_unreachable(ast, roots)
+    return CompiledProgram(ast, out=out)
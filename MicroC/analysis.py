@@ -0,0 +1,300 @@
+import heapq
+from dataclasses import fields, is_dataclass
+
+from .ast import *
+from .errors import SemanticError
+
+
+def iter_nodes(node):
+    """
+    Percorre iterativamente todos os nós da ast a partir de `node`, sem
+    depender do limite de recursão do Python.
+    """
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, Node):
+            yield item
+            if is_dataclass(item):
+                stack.extend(reversed([getattr(item, f.name) for f in fields(item)]))
+
+
+def max_scope_depth(program):
+    """
+    Maior profundidade de escopos aninhados no programa: o escopo global
+    conta como 1, o corpo de uma função como 2 e cada bloco interno soma 1.
+    """
+    deepest = 1
+    stack = [(program, 1)]
+    while stack:
+        item, depth = stack.pop()
+        if isinstance(item, list):
+            stack.extend((child, depth) for child in item)
+            continue
+        if not isinstance(item, Node) or not is_dataclass(item):
+            continue
+        if isinstance(item, FunDecl):
+            # o corpo da função compartilha o escopo dos parâmetros
+            depth += 1
+            stack.append((item.body.stmts, depth))
+        else:
+            if isinstance(item, Block):
+                depth += 1
+            stack.extend((getattr(item, f.name), depth) for f in fields(item))
+        deepest = max(deepest, depth)
+    return deepest
+
+
+class FreeNames:
+    """
+    Visitor que coleta os nomes livres (variáveis usadas e não declaradas
+    localmente) e as funções chamadas por um trecho da ast.
+    """
+
+    def __init__(self, scope=()):
+        self.scopes = [set(scope)]
+        self.names = set()
+        self.calls = set()
+
+    def _use(self, name):
+        for scope in self.scopes:
+            if name in scope:
+                return
+        self.names.add(name)
+
+    def _visit_stmts(self, stmts):
+        for stmt in stmts:
+            stmt.eval(self)
+
+    def visit_program(self, node):
+        self._visit_stmts(node.declarations)
+
+    def visit_var_decl(self, node):
+        if node.init is not None:
+            node.init.eval(self)
+        self.scopes[-1].add(node.name)
+
+    def visit_fun_decl(self, node):
+        # os parâmetros e as declarações do corpo vivem no mesmo escopo,
+        # como em Interpreter._call_function
+        self.scopes.append({param.name for param in node.params})
+        self._visit_stmts(node.body.stmts)
+        self.scopes.pop()
+
+    def visit_param(self, node):
+        pass
+
+    def visit_block(self, node):
+        self.scopes.append(set())
+        self._visit_stmts(node.stmts)
+        self.scopes.pop()
+
+    def visit_expr_stmt(self, node):
+        node.expr.eval(self)
+
+    def visit_if_stmt(self, node):
+        node.condition.eval(self)
+        node.then_stmt.eval(self)
+        if node.else_stmt:
+            node.else_stmt.eval(self)
+
+    def visit_while_stmt(self, node):
+        node.condition.eval(self)
+        node.body.eval(self)
+
+    def visit_return_stmt(self, node):
+        if node.expr:
+            node.expr.eval(self)
+
+    def visit_assignment(self, node):
+        node.value.eval(self)
+        self._use(node.name)
+
+    def visit_binary_op(self, node):
+        node.left.eval(self)
+        node.right.eval(self)
+
+    def visit_unary_op(self, node):
+        node.operand.eval(self)
+
+    def visit_function_call(self, node):
+        for arg in node.args:
+            arg.eval(self)
+        self.calls.add(node.name)
+
+    def visit_print_call(self, node):
+        node.expr.eval(self)
+
+    def visit_variable(self, node):
+        self._use(node.name)
+
+    def visit_int_literal(self, node):
+        pass
+
+    def visit_bool_literal(self, node):
+        pass
+
+
+def free_names(node):
+    visitor = FreeNames()
+    node.eval(visitor)
+    return visitor.names, visitor.calls
+
+
+def reachable_functions(program, roots=('main',)):
+    """
+    Nomes das funções alcançáveis a partir de `roots` e dos inicializadores
+    das variáveis globais, seguindo as chamadas de forma estática. Funções
+    preguiçosas (LazyFunDecl) são analisadas sem converter o corpo.
+    """
+    functions = {}
+    pending = list(roots)
+    for decl in program.declarations:
+        if isinstance(decl, (FunDecl, LazyFunDecl)):
+            functions[decl.name] = decl
+        elif isinstance(decl, VarDecl) and decl.init is not None:
+            pending.extend(free_names(decl.init)[1])
+
+    reachable = set()
+    while pending:
+        name = pending.pop()
+        if name in reachable or name not in functions:
+            continue
+        reachable.add(name)
+        func = functions[name]
+        calls = func.calls() if isinstance(func, LazyFunDecl) else free_names(func)[1]
+        pending.extend(calls - reachable)
+    return reachable
+
+
+def prune_unreachable(program, roots=('main',)):
+    """
+    Devolve um novo Program sem as funções que não são alcançáveis a partir
+    de `roots` (veja reachable_functions).
+    """
+    reachable = reachable_functions(program, roots)
+    return Program([
+        decl for decl in program.declarations
+        if not isinstance(decl, (FunDecl, LazyFunDecl)) or decl.name in reachable
+    ])
+
+
+def global_dependencies(program, functions):
+    """
+    Dependências entre as variáveis globais. Devolve (decls, direct,
+    indirect): as declarações por nome, as globais lidas ou escritas
+    diretamente por cada inicializador e as que só são alcançadas através
+    das funções que ele chama.
+    """
+    decls = {}
+    for decl in program.declarations:
+        if isinstance(decl, VarDecl):
+            decls.pop(decl.name, None)
+            decls[decl.name] = decl
+
+    fun_deps = {}
+
+    def function_globals(name):
+        # fecho transitivo das variáveis globais usadas por uma função
+        if name in fun_deps:
+            return fun_deps[name]
+        result = fun_deps[name] = set()
+        pending = [name]
+        seen = {name}
+        while pending:
+            func = functions.get(pending.pop())
+            if func is None:
+                continue
+            names, calls = free_names(func)
+            result.update(n for n in names if n in decls)
+            for call in calls - seen:
+                seen.add(call)
+                pending.append(call)
+        return result
+
+    direct = {}
+    indirect = {}
+    for name, decl in decls.items():
+        direct[name] = set()
+        indirect[name] = set()
+        if decl.init is None:
+            continue
+        names, calls = free_names(decl.init)
+        direct[name].update(n for n in names if n in decls)
+        for call in calls:
+            indirect[name].update(function_globals(call))
+        indirect[name] -= direct[name]
+    return decls, direct, indirect
+
+
+def _check_direct_cycles(decls, direct):
+    position = {name: i for i, name in enumerate(decls)}
+    state = {}
+    for root in decls:
+        if root in state:
+            continue
+        state[root] = 'visiting'
+        stack = [(root, iter(sorted(direct[root], key=position.get)))]
+        while stack:
+            name, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                state[name] = 'done'
+            elif state.get(child) == 'visiting':
+                raise SemanticError(
+                    f"dependência circular na inicialização da variável global '{child}'"
+                )
+            elif child not in state:
+                state[child] = 'visiting'
+                stack.append((child, iter(sorted(direct[child], key=position.get))))
+
+
+def global_init_order(program, functions):
+    """
+    Ordena as declarações globais de forma que cada inicializador seja
+    avaliado depois das variáveis globais que ele lê ou escreve, inclusive
+    através das funções que ele chama.
+
+    Só um ciclo de referências diretas entre inicializadores levanta
+    SemanticError. Uma função pode usar uma global apenas em um caminho que
+    nunca executa, então os ciclos que passam por chamadas são resolvidos
+    seguindo só as referências diretas; se a global for de fato lida antes
+    de ter valor, o erro aparece na execução (veja Interpreter._init_globals).
+    """
+    decls, direct, indirect = global_dependencies(program, functions)
+    _check_direct_cycles(decls, direct)
+
+    names = list(decls)
+    position = {name: i for i, name in enumerate(names)}
+    users = {name: [] for name in names}
+    waiting = {}
+    for name in names:
+        deps = direct[name] | indirect[name]
+        waiting[name] = len(deps)
+        for dep in deps:
+            users[dep].append(name)
+
+    # ordem topológica que, entre as globais prontas, segue a ordem do
+    # código
+    ready = [position[name] for name in names if not waiting[name]]
+    heapq.heapify(ready)
+    done = set()
+    order = []
+    while len(order) < len(names):
+        if ready:
+            name = names[heapq.heappop(ready)]
+            if name in done:
+                continue
+        else:
+            # só restam ciclos que passam por chamadas de função
+            name = next(n for n in names if n not in done and direct[n] <= done)
+        done.add(name)
+        order.append(decls[name])
+        for user in users[name]:
+            waiting[user] -= 1
+            if not waiting[user] and user not in done:
+                heapq.heappush(ready, position[user])
+    return order
@@ -1,3 +1,4 @@
+import threading
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 from typing import List, Optional, Union, Any
@@ -48,6 +49,63 @@ class FunDecl(Decl):
         return visitor.visit_fun_decl(self)
 
 
+@dataclass
+class LazyFunDecl(Decl):
+    """
+    Declaração de função cujo corpo ainda é a subárvore do Lark. O corpo só
+    é convertido para ast (uma única vez) quando a função é usada.
+
+    A conversão é feita sob `lock`, então a mesma declaração pode ser usada
+    por várias threads ao mesmo tempo.
+    """
+
+    type: str
+    name: str
+    params: List['Param']
+    tree: Any
+
+    def __post_init__(self):
+        self._fun = None
+        self.lock = threading.RLock()
+
+    def materialize(self):
+        fun = self._fun
+        if fun is None:
+            with self.lock:
+                # outra thread pode ter convertido o corpo enquanto esta
+                # esperava pelo lock
+                fun = self._fun
+                if fun is None:
+                    from .transformer import MicroCTransformer
+                    body = MicroCTransformer().transform(self.tree)
+                    fun = self._fun = FunDecl(self.type, self.name, self.params, body)
+                    # a subárvore só é descartada depois que _fun está
+                    # publicada
+                    self.tree = None
+        return fun
+
+    @property
+    def materialized(self):
+        """
+        A FunDecl convertida, ou None se o corpo ainda não foi convertido.
+        """
+        return self._fun
+
+    def calls(self):
+        """
+        Nomes das funções chamadas no corpo, sem converter a subárvore.
+        """
+        with self.lock:
+            fun, tree = self._fun, self.tree
+        if fun is not None:
+            from .analysis import free_names
+            return free_names(fun)[1]
+        return {str(call.children[0]) for call in tree.find_data('fun_call')}
+
+    def eval(self, visitor):
+        return self.materialize().eval(visitor)
+
+
 @dataclass
 class Param(Node):
 
@@ -216,12 +274,14 @@ class Printer:
         return "  " * self.indent_level
 
     def visit_program(self, node: Program):
-        result = "Program:\n"
-        self.indent_level += 1
-        for decl in node.declarations:
-            result += self._indent() + str(decl.eval(self)) + "\n"
-        self.indent_level -= 1
-        return result.rstrip()
+        # o programa inteiro é escrito pelo dump incremental, que evita
+        # concatenar strings cada vez maiores
+        from io import StringIO
+        from .dump import dump_ast
+
+        result = StringIO()
+        dump_ast(node, result)
+        return result.getvalue().rstrip()
 
     def visit_var_decl(self, node: VarDecl):
         return f"VarDecl({node.type} {node.name})"
@@ -1,9 +1,13 @@
 import argparse
+import sys
+from contextlib import nullcontext
 
 from lark import Lark
 from . import parser as microc_parser
 from .parser import parse_source
 from . import eval as MicroC_eval
+from .stats import Stats, phase
+from .dump import FORMATS, dump_ast, dump_cst
 
 def make_argparser():
     parser = argparse.ArgumentParser(description="Compilador Lox")
@@ -23,6 +27,52 @@ def make_argparser():
         action="store_true",
         help="Imprime a árvore sintática concreta produzida pelo Lark.",
     )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Formato da árvore impressa por --ast/--cst: texto, json ou s-expression.",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=None,
+        help="Profundidade máxima da árvore impressa; nós mais profundos aparecem como '...'.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Arquivo onde a árvore impressa por --ast/--cst é escrita (padrão: saída padrão).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["python", "native"],
+        default="python",
+        help="Executa no interpretador Python ou compila para C e carrega via ctypes (native).",
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Converte cada função só na primeira chamada e descarta as que main não alcança.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Imprime em stderr o tempo, a memória e os objetos de cada etapa.",
+    )
+    parser.add_argument(
+        "--stats-format",
+        choices=["text", "json"],
+        default="text",
+        help="Formato das estatísticas impressas por --stats.",
+    )
+    parser.add_argument(
+        "--stats-memory",
+        action="store_true",
+        help="Mede também o pico de memória de cada etapa (tracemalloc); deixa os tempos bem maiores.",
+    )
     return parser
 
 def main():
@@ -35,21 +85,40 @@ def main():
         print(f"Arquivo {args.file} não encontrado.")
         exit(1)
 
+    stats = Stats(memory=args.stats_memory) if args.stats else None
+    try:
+        run(args, source, stats)
+    finally:
+        if stats is not None:
+            report = stats.to_json() if args.stats_format == "json" else stats.format()
+            print(report, file=sys.stderr)
+
+def run(args, source, stats):
     if not args.ast and not args.cst:
-            MicroC_eval(source)
+            MicroC_eval(source, stats=stats, lazy=args.lazy, engine=args.engine)
 
     if args.cst:
-        tree = parse_source(source)
+        with phase(stats, "parse"):
+            tree = parse_source(source)
         if tree:
-            print(tree.pretty())
+            with open_output(args.output) as out:
+                dump_cst(tree, out, args.format, args.max_depth)
         return
 
     if args.ast:
         from .transformer import MicroCTransformer
-        tree = parse_source(source)
+        with phase(stats, "parse"):
+            tree = parse_source(source)
         if tree:
-            ast = MicroCTransformer().transform(tree)
-            from .ast import Printer
-            content = Printer()
-            print(ast.eval(content))
-        return
\ No newline at end of file
+            with phase(stats, "transform"):
+                ast = MicroCTransformer().transform(tree)
+            if stats is not None:
+                stats.record_program(ast)
+            with open_output(args.output) as out:
+                dump_ast(ast, out, args.format, args.max_depth)
+        return
+
+def open_output(path):
+    if path is None:
+        return nullcontext(sys.stdout)
+    return open(path, "w", encoding="utf-8")
\ No newline at end of file
@@ -0,0 +1,328 @@
+import json
+import re
+from dataclasses import fields
+from json.encoder import encode_basestring
+
+from lark import Tree
+
+from .ast import *
+
+FORMATS = ("text", "json", "sexp")
+
+ELIDED = "..."
+
+# tamanho (em caracteres) acumulado antes de cada escrita no arquivo
+BUFFER_SIZE = 1 << 16
+
+_BARE_ATOM = re.compile(r'^[^\s()"]+$')
+
+
+class _Writer:
+    """
+    Acumula pequenos pedaços de texto e os escreve em blocos no arquivo de
+    saída.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self.parts = []
+        self.size = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        self.out.write("".join(self.parts))
+        self.parts = []
+        self.size = 0
+
+
+def _stream(root, expand, elide, out, max_depth):
+    # percurso iterativo: a pilha guarda textos prontos e nós ainda não
+    # expandidos como (nó, nível de indentação, profundidade), então o
+    # tempo é linear no tamanho da saída e nada depende do limite de
+    # recursão do Python
+    writer = _Writer(out)
+    stack = [(root, 0, 0)]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            writer.write(item)
+            continue
+        node, level, depth = item
+        if max_depth is not None and depth > max_depth:
+            writer.write(elide(level))
+            continue
+        parts = expand(node, level, depth)
+        parts.reverse()
+        stack.extend(parts)
+    writer.flush()
+
+
+_FIELDS = {}
+
+
+def _fields(node):
+    names = _FIELDS.get(node.__class__)
+    if names is None:
+        names = _FIELDS[node.__class__] = [f.name for f in fields(node)]
+    return names
+
+
+def _atom(value):
+    if value is None:
+        return "nil"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    text = str(value)
+    if _BARE_ATOM.match(text):
+        return text
+    return json.dumps(text)
+
+
+# formato texto da ast: reproduz exatamente a saída de Printer
+
+def _indent(level):
+    return "\n" + "  " * level
+
+
+def _text_program(node, level, depth):
+    parts = ["Program:"]
+    for decl in node.declarations:
+        parts.append(_indent(1))
+        parts.append((decl, 1, depth + 1))
+    parts.append("\n")
+    return parts
+
+
+def _text_fun_decl(node, level, depth):
+    params = ", ".join(f"{param.type} {param.name}" for param in node.params)
+    return [
+        f"FunDecl({node.type} {node.name}({params}))",
+        _indent(level + 1),
+        (node.body, level + 1, depth + 1),
+    ]
+
+
+def _text_block(node, level, depth):
+    parts = ["Block:"]
+    for stmt in node.stmts:
+        parts.append(_indent(level + 1))
+        parts.append((stmt, level + 1, depth + 1))
+    return parts
+
+
+def _text_if_stmt(node, level, depth):
+    parts = [
+        "IfStmt(", (node.condition, level, depth + 1), ")",
+        _indent(level + 1) + "Then: ", (node.then_stmt, level + 1, depth + 1),
+    ]
+    if node.else_stmt:
+        parts.append(_indent(level + 1) + "Else: ")
+        parts.append((node.else_stmt, level + 1, depth + 1))
+    return parts
+
+
+def _text_while_stmt(node, level, depth):
+    return [
+        "WhileStmt(", (node.condition, level, depth + 1), ")",
+        _indent(level + 1), (node.body, level + 1, depth + 1),
+    ]
+
+
+def _text_return(node, level, depth):
+    if node.expr:
+        return ["Return(", (node.expr, level, depth + 1), ")"]
+    return ["Return()"]
+
+
+def _text_function(node, level, depth):
+    parts = [f"Function({node.name}("]
+    for i, arg in enumerate(node.args):
+        if i:
+            parts.append(", ")
+        parts.append((arg, level, depth + 1))
+    parts.append("))")
+    return parts
+
+
+_TEXT_AST = {
+    Program: _text_program,
+    VarDecl: lambda node, level, depth: [f"VarDecl({node.type} {node.name})"],
+    FunDecl: _text_fun_decl,
+    Param: lambda node, level, depth: [f"{node.type} {node.name}"],
+    Block: _text_block,
+    ExprStmt: lambda node, level, depth: ["ExprStmt(", (node.expr, level, depth + 1), ")"],
+    IfStmt: _text_if_stmt,
+    WhileStmt: _text_while_stmt,
+    Return: _text_return,
+    Assign: lambda node, level, depth: [f"Assign({node.name} = ", (node.value, level, depth + 1), ")"],
+    BinOp: lambda node, level, depth: [
+        "BinOp(", (node.left, level, depth + 1), f" {node.operator} ", (node.right, level, depth + 1), ")",
+    ],
+    UnaryOp: lambda node, level, depth: [f"UnaryOp({node.operator} ", (node.operand, level, depth + 1), ")"],
+    Function: _text_function,
+    Print: lambda node, level, depth: ["Print(", (node.expr, level, depth + 1), ")"],
+    Var: lambda node, level, depth: [f"Var({node.name})"],
+    Int: lambda node, level, depth: [f"Int({node.value})"],
+    Bool: lambda node, level, depth: [f"Bool({str(node.value).lower()})"],
+}
+
+
+def _text_ast(node, level, depth):
+    if node.__class__ is LazyFunDecl:
+        node = node.materialize()
+    expand = _TEXT_AST.get(node.__class__)
+    if expand is None:
+        return [str(node)]
+    return expand(node, level, depth)
+
+
+# formatos json e s-expression da ast: genéricos sobre os campos dos nós
+
+def _json_value(value, depth, parts):
+    if isinstance(value, str):
+        parts.append(encode_basestring(value))
+    elif isinstance(value, Node):
+        parts.append((value, 0, depth))
+    elif isinstance(value, list):
+        parts.append("[")
+        for i, item in enumerate(value):
+            if i:
+                parts.append(",")
+            _json_value(item, depth, parts)
+        parts.append("]")
+    else:
+        parts.append(json.dumps(value))
+
+
+def _json_ast(node, level, depth):
+    if node.__class__ is LazyFunDecl:
+        node = node.materialize()
+    parts = ['{"node":"' + node.__class__.__name__ + '"']
+    for name in _fields(node):
+        parts.append(f',"{name}":')
+        _json_value(getattr(node, name), depth + 1, parts)
+    parts.append("}")
+    return parts
+
+
+def _sexp_value(value, depth, parts):
+    if isinstance(value, Node):
+        parts.append((value, 0, depth))
+    elif isinstance(value, list):
+        parts.append("(")
+        for i, item in enumerate(value):
+            if i:
+                parts.append(" ")
+            _sexp_value(item, depth, parts)
+        parts.append(")")
+    else:
+        parts.append(_atom(value))
+
+
+def _sexp_ast(node, level, depth):
+    if node.__class__ is LazyFunDecl:
+        node = node.materialize()
+    parts = ["(" + node.__class__.__name__]
+    for name in _fields(node):
+        parts.append(" ")
+        _sexp_value(getattr(node, name), depth + 1, parts)
+    parts.append(")")
+    return parts
+
+
+# formatos da cst produzida pelo Lark; o texto segue Tree.pretty()
+
+def _text_cst(tree, level, depth):
+    children = tree.children
+    if len(children) == 1 and not isinstance(children[0], Tree):
+        return ["  " * level + f"{tree.data}\t{children[0]}\n"]
+    parts = ["  " * level + f"{tree.data}\n"]
+    for child in children:
+        if isinstance(child, Tree):
+            parts.append((child, level + 1, depth + 1))
+        else:
+            parts.append("  " * (level + 1) + f"{child}\n")
+    return parts
+
+
+def _json_token(token):
+    kind = getattr(token, "type", None)
+    return '{"token":' + json.dumps(kind) + ',"value":' + encode_basestring(str(token)) + "}"
+
+
+def _json_cst(tree, level, depth):
+    parts = ['{"rule":', json.dumps(str(tree.data)), ',"children":[']
+    for i, child in enumerate(tree.children):
+        if i:
+            parts.append(",")
+        if isinstance(child, Tree):
+            parts.append((child, 0, depth + 1))
+        else:
+            parts.append(_json_token(child))
+    parts.append("]}")
+    return parts
+
+
+def _sexp_cst(tree, level, depth):
+    parts = ["(" + _atom(tree.data)]
+    for child in tree.children:
+        parts.append(" ")
+        if isinstance(child, Tree):
+            parts.append((child, 0, depth + 1))
+        else:
+            parts.append(_atom(child))
+    parts.append(")")
+    return parts
+
+
+def _elide_inline(level):
+    return ELIDED
+
+
+def _elide_json(level):
+    return json.dumps(ELIDED)
+
+
+def _elide_cst_text(level):
+    return "  " * level + ELIDED + "\n"
+
+
+_AST_FORMATS = {
+    "text": (_text_ast, _elide_inline),
+    "json": (_json_ast, _elide_json),
+    "sexp": (_sexp_ast, _elide_inline),
+}
+
+_CST_FORMATS = {
+    "text": (_text_cst, _elide_cst_text),
+    "json": (_json_cst, _elide_json),
+    "sexp": (_sexp_cst, _elide_inline),
+}
+
+
+def dump_ast(node, out, format="text", max_depth=None):
+    """
+    Escreve a ast em `out` de forma incremental. `format` pode ser "text"
+    (o mesmo texto de Printer), "json" ou "sexp"; nós mais profundos que
+    `max_depth` são substituídos por "...".
+    """
+    expand, elide = _AST_FORMATS[format]
+    _stream(node, expand, elide, out, max_depth)
+    if format != "text":
+        out.write("\n")
+
+
+def dump_cst(tree, out, format="text", max_depth=None):
+    """
+    Escreve a cst do Lark em `out` de forma incremental, nos mesmos
+    formatos de dump_ast. O formato texto é o de Tree.pretty().
+    """
+    expand, elide = _CST_FORMATS[format]
+    _stream(tree, expand, elide, out, max_depth)
+    if format != "text":
+        out.write("\n")
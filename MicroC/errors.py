@@ -15,6 +15,19 @@ class SemanticError(Exception):
         self.token = token
 
 
+class ParseError(Exception):
+    """
+    Exceção para erros de sintaxe.
+    """
+
+
+class NativeUnsupported(Exception):
+    """
+    Exceção para programas que o backend nativo não consegue traduzir para C
+    mantendo a semântica do interpretador.
+    """
+
+
 class ForceReturn(Exception):
     """
     Exceção que serve para forçar uma função a retornar durante a avaliação
@@ -0,0 +1,170 @@
+import argparse
+import random
+
+SHAPES = ("flat", "right", "balanced")
+
+
+class ProgramGenerator:
+    """
+    Gera programas Micro-C válidos e que terminam, a partir de uma semente,
+    para medir como as etapas do interpretador escalam com o tamanho do
+    programa.
+
+    - `functions`: número de funções além de main
+    - `depth`: profundidade de aninhamento de if/while/blocos
+    - `expr_size`: número de operandos de cada expressão
+    - `globals`: número de variáveis globais
+    - `statements`: comandos por bloco
+    - `shape`: forma das expressões; "flat" gera cadeias `a + b - c`,
+      "right" gera `a + (b + (c ...))`, aninhadas à direita, e "balanced"
+      gera árvores balanceadas com parênteses
+    """
+
+    def __init__(self, seed=0, functions=10, depth=2, expr_size=4, globals=5,
+                 statements=3, shape="flat"):
+        if shape not in SHAPES:
+            raise ValueError(f"forma de expressão desconhecida: {shape}")
+        self.random = random.Random(seed)
+        self.functions = functions
+        self.depth = depth
+        self.expr_size = max(1, expr_size)
+        self.globals = globals
+        self.statements = max(1, statements)
+        self.shape = shape
+        self.counter = 0
+
+    def generate(self):
+        out = []
+        for i in range(self.globals):
+            # cada global lê apenas globais declaradas antes dela
+            names = [f"g{j}" for j in range(i)]
+            out.append(f"int g{i} = {self._expr(names, self.expr_size)};\n")
+
+        # as primeiras funções são folhas; as demais só chamam folhas, o que
+        # mantém a profundidade de chamadas constante
+        leaves = max(1, self.functions // 10)
+        for i in range(self.functions):
+            callees = [] if i < leaves else [f"f{j}" for j in range(min(i, leaves))]
+            out.append(self._function(f"f{i}", callees))
+
+        callees = [f"f{j}" for j in range(self.functions)]
+        out.append(self._function("main", callees, params=()))
+        return "".join(out)
+
+    def _function(self, name, callees, params=("a", "b")):
+        names = list(params) + [f"g{j}" for j in range(self.globals)]
+        header = ", ".join(f"int {p}" for p in params)
+        body = []
+        self._stmts(body, names, callees, self.depth, 1)
+        result = self._expr(names, self.expr_size)
+        if callees:
+            result = f"{result} + {self._call(names, callees)}"
+        body.append(f"    return {result};\n")
+        return f"int {name}({header}) {{\n{''.join(body)}}}\n\n"
+
+    def _call(self, names, callees):
+        callee = self.random.choice(callees)
+        args = ", ".join(self._operand(names) for _ in range(2))
+        return f"{callee}({args})"
+
+    def _fresh(self, prefix):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def _stmts(self, body, names, callees, depth, level):
+        pad = "    " * level
+        names = list(names)
+        for _ in range(self.statements):
+            kind = self.random.choice(("decl", "assign", "if", "while", "block") if depth > 0 else ("decl", "assign"))
+            if kind == "assign" and not names:
+                kind = "decl"
+            if kind == "decl":
+                var = self._fresh("v")
+                body.append(f"{pad}int {var} = {self._expr(names, self.expr_size)};\n")
+                names.append(var)
+            elif kind == "assign":
+                target = self.random.choice(names)
+                body.append(f"{pad}{target} = {self._expr(names, self.expr_size)};\n")
+            elif kind == "if":
+                body.append(f"{pad}if ({self._operand(names)} < {self._expr(names, self.expr_size)}) {{\n")
+                self._stmts(body, names, callees, depth - 1, level + 1)
+                body.append(f"{pad}}} else {{\n")
+                self._stmts(body, names, callees, depth - 1, level + 1)
+                body.append(f"{pad}}}\n")
+            elif kind == "while":
+                # contador próprio, que o corpo nunca altera: o laço sempre termina
+                counter = self._fresh("i")
+                body.append(f"{pad}int {counter} = 0;\n")
+                body.append(f"{pad}while ({counter} < 2) {{\n")
+                self._stmts(body, names, callees, depth - 1, level + 1)
+                body.append(f"{pad}    {counter} = {counter} + 1;\n")
+                body.append(f"{pad}}}\n")
+            else:
+                body.append(f"{pad}{{\n")
+                self._stmts(body, names, callees, depth - 1, level + 1)
+                body.append(f"{pad}}}\n")
+
+    def _operand(self, names):
+        if names and self.random.random() < 0.6:
+            return self.random.choice(names)
+        return str(self.random.randint(0, 9))
+
+    def _expr(self, names, size):
+        operands = [self._operand(names) for _ in range(size)]
+        ops = [self.random.choice(("+", "-")) for _ in range(size - 1)]
+        if self.shape == "flat":
+            parts = [operands[0]]
+            for op, operand in zip(ops, operands[1:]):
+                parts.append(f" {op} {operand}")
+            return "".join(parts)
+        if self.shape == "right":
+            # montado de trás para frente, sem recursão
+            result = operands[-1]
+            for op, operand in zip(reversed(ops), reversed(operands[:-1])):
+                result = f"{operand} {op} ({result})"
+            return result
+        return self._balanced(operands, ops)
+
+    def _balanced(self, operands, ops):
+        if len(operands) == 1:
+            return operands[0]
+        middle = len(operands) // 2
+        left = self._balanced(operands[:middle], ops[:middle - 1])
+        right = self._balanced(operands[middle:], ops[middle:])
+        return f"({left}) {ops[middle - 1]} ({right})"
+
+
+def generate_program(seed=0, **options):
+    """
+    Atalho para ProgramGenerator(seed, **options).generate().
+    """
+    return ProgramGenerator(seed, **options).generate()
+
+
+def make_argparser():
+    parser = argparse.ArgumentParser(description="Gerador de programas Micro-C sintéticos")
+    parser.add_argument("--seed", type=int, default=0, help="Semente do gerador.")
+    parser.add_argument("--functions", type=int, default=10, help="Número de funções além de main.")
+    parser.add_argument("--depth", type=int, default=2, help="Profundidade de aninhamento dos comandos.")
+    parser.add_argument("--expr-size", type=int, default=4, help="Número de operandos por expressão.")
+    parser.add_argument("--globals", type=int, default=5, help="Número de variáveis globais.")
+    parser.add_argument("--statements", type=int, default=3, help="Comandos por bloco.")
+    parser.add_argument("--shape", choices=SHAPES, default="flat", help="Forma das expressões.")
+    return parser
+
+
+def main():
+    args = make_argparser().parse_args()
+    print(generate_program(
+        args.seed,
+        functions=args.functions,
+        depth=args.depth,
+        expr_size=args.expr_size,
+        globals=args.globals,
+        statements=args.statements,
+        shape=args.shape,
+    ), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,710 @@
+"""
+Backend nativo: traduz a ast para C, compila com o compilador C do sistema
+para uma biblioteca compartilhada (guardada em cache no disco, pelo hash do
+código gerado) e chama as funções via ctypes.
+
+Os valores são representados em C com uma marca de tipo (int, bool ou
+None), reproduzindo o comportamento dinâmico do Interpreter: print de um
+bool escreve True/False, aritmética com bool produz int, a divisão é a
+divisão inteira do Python (arredonda para baixo) e uma função que termina
+sem return devolve None.
+
+Sempre que o backend não pode garantir o mesmo resultado, o interpretador
+Python é usado: sem compilador C, programas que dependem do escopo dinâmico
+das chamadas, e erros em tempo de execução (divisão por zero, estouro de 64
+bits, recursão profunda, erros de tipo ou de nome). Como a saída de print é
+acumulada em C e só escrita no fim, repetir a execução no interpretador não
+duplica a saída.
+
+Diferença aceita: o código nativo chega a MAX_DEPTH chamadas aninhadas,
+enquanto o interpretador esgota antes o limite de recursão do Python
+(RecursionError). Um programa com recursão profunda pode, portanto,
+terminar no backend nativo e falhar no interpretador.
+
+    python -m MicroC.native exemplos/*.mc
+
+compara, para cada arquivo, a saída do backend nativo com a do
+interpretador.
+"""
+import ctypes
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+from .analysis import free_names, global_dependencies, global_init_order, iter_nodes
+from .ast import *
+from .errors import NativeUnsupported, ParseError, SemanticError
+
+# limite de chamadas aninhadas no código nativo; acima dele a execução é
+# repetida no interpretador
+MAX_DEPTH = 10000
+
+CFLAGS = ["-O2", "-shared", "-fPIC"]
+
+INT, BOOL, NONE = 0, 1, 2
+
+ERRORS = {
+    1: "erro em tempo de execução",
+    2: "divisão por zero",
+    3: "estouro de inteiro de 64 bits",
+    4: "recursão profunda demais",
+    5: "erro de tipo",
+    6: "memória insuficiente",
+}
+
+INT_MIN = -(1 << 63)
+INT_MAX = (1 << 63) - 1
+
+RUNTIME = r"""
+#include <limits.h>
+#include <setjmp.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define MC_INT 0
+#define MC_BOOL 1
+#define MC_NONE 2
+
+#define MC_RUNTIME_ERROR 1
+#define MC_ZERO_DIVISION 2
+#define MC_OVERFLOW 3
+#define MC_RECURSION 4
+#define MC_TYPE_ERROR 5
+#define MC_NO_MEMORY 6
+
+typedef struct { long long v; int k; } mc_val;
+
+static jmp_buf mc_jmp;
+static int mc_depth;
+static char *mc_out;
+static size_t mc_out_len, mc_out_cap;
+
+static void mc_fail(int code) { longjmp(mc_jmp, code); }
+
+static mc_val mc_int(long long v) { mc_val r = {v, MC_INT}; return r; }
+static mc_val mc_bool(int b) { mc_val r = {b != 0, MC_BOOL}; return r; }
+static mc_val mc_none(void) { mc_val r = {0, MC_NONE}; return r; }
+
+static long long mc_num(mc_val a) {
+    if (a.k == MC_NONE) mc_fail(MC_TYPE_ERROR);
+    return a.v;
+}
+
+static int mc_truth(mc_val a) { return a.k != MC_NONE && a.v != 0; }
+
+static mc_val mc_add(mc_val a, mc_val b) {
+    long long r;
+    if (__builtin_add_overflow(mc_num(a), mc_num(b), &r)) mc_fail(MC_OVERFLOW);
+    return mc_int(r);
+}
+
+static mc_val mc_sub(mc_val a, mc_val b) {
+    long long r;
+    if (__builtin_sub_overflow(mc_num(a), mc_num(b), &r)) mc_fail(MC_OVERFLOW);
+    return mc_int(r);
+}
+
+static mc_val mc_mul(mc_val a, mc_val b) {
+    long long r;
+    if (__builtin_mul_overflow(mc_num(a), mc_num(b), &r)) mc_fail(MC_OVERFLOW);
+    return mc_int(r);
+}
+
+/* divisão inteira do Python: arredonda para baixo */
+static mc_val mc_div(mc_val a, mc_val b) {
+    long long x = mc_num(a), y = mc_num(b), q;
+    if (y == 0) mc_fail(MC_ZERO_DIVISION);
+    if (x == LLONG_MIN && y == -1) mc_fail(MC_OVERFLOW);
+    q = x / y;
+    if (x % y != 0 && ((x < 0) != (y < 0))) q--;
+    return mc_int(q);
+}
+
+static mc_val mc_eq(mc_val a, mc_val b) {
+    if (a.k == MC_NONE || b.k == MC_NONE) return mc_int(a.k == b.k);
+    return mc_int(a.v == b.v);
+}
+
+static mc_val mc_ne(mc_val a, mc_val b) { return mc_int(!mc_eq(a, b).v); }
+static mc_val mc_lt(mc_val a, mc_val b) { return mc_int(mc_num(a) < mc_num(b)); }
+static mc_val mc_gt(mc_val a, mc_val b) { return mc_int(mc_num(a) > mc_num(b)); }
+static mc_val mc_le(mc_val a, mc_val b) { return mc_int(mc_num(a) <= mc_num(b)); }
+static mc_val mc_ge(mc_val a, mc_val b) { return mc_int(mc_num(a) >= mc_num(b)); }
+static mc_val mc_and(mc_val a, mc_val b) { return mc_int(mc_truth(a) && mc_truth(b)); }
+static mc_val mc_or(mc_val a, mc_val b) { return mc_int(mc_truth(a) || mc_truth(b)); }
+
+static mc_val mc_neg(mc_val a) {
+    long long x = mc_num(a);
+    if (x == LLONG_MIN) mc_fail(MC_OVERFLOW);
+    return mc_int(-x);
+}
+
+static mc_val mc_pos(mc_val a) { return mc_int(mc_num(a)); }
+static mc_val mc_not(mc_val a) { return mc_int(!mc_truth(a)); }
+
+static void mc_write(const char *text, size_t len) {
+    if (mc_out_len + len > mc_out_cap) {
+        size_t cap = mc_out_cap ? mc_out_cap : 4096;
+        char *out;
+        while (cap < mc_out_len + len) cap *= 2;
+        out = realloc(mc_out, cap);
+        if (!out) mc_fail(MC_NO_MEMORY);
+        mc_out = out;
+        mc_out_cap = cap;
+    }
+    memcpy(mc_out + mc_out_len, text, len);
+    mc_out_len += len;
+}
+
+/* mesmo texto que print(value) no Python */
+static void mc_print(mc_val a) {
+    char buf[32];
+    int len;
+    if (a.k == MC_NONE) len = snprintf(buf, sizeof buf, "None\n");
+    else if (a.k == MC_BOOL) len = snprintf(buf, sizeof buf, a.v ? "True\n" : "False\n");
+    else len = snprintf(buf, sizeof buf, "%lld\n", a.v);
+    mc_write(buf, (size_t)len);
+}
+
+#define MC_ENTER() do { if (++mc_depth > MC_MAX_DEPTH) mc_fail(MC_RECURSION); } while (0)
+#define MC_LEAVE() (mc_depth--)
+
+const char *mc_output_data(void) { return mc_out; }
+size_t mc_output_size(void) { return mc_out_len; }
+"""
+
+_BINARY = {
+    '+': 'mc_add', '-': 'mc_sub', '*': 'mc_mul', '/': 'mc_div',
+    '==': 'mc_eq', '!=': 'mc_ne', '<': 'mc_lt', '>': 'mc_gt',
+    '<=': 'mc_le', '>=': 'mc_ge', '&&': 'mc_and', '||': 'mc_or',
+}
+
+_UNARY = {'-': 'mc_neg', '+': 'mc_pos', '!': 'mc_not'}
+
+
+def _declared_names(func):
+    names = {param.name for param in func.params}
+    for node in iter_nodes(func.body):
+        if isinstance(node, VarDecl):
+            names.add(node.name)
+    return names
+
+
+class CGenerator:
+    """
+    Traduz um Program para código C. Levanta NativeUnsupported quando a
+    tradução não teria a mesma semântica do Interpreter.
+    """
+
+    def __init__(self, program):
+        self.program = program
+        self.functions = {}
+        for decl in program.declarations:
+            if isinstance(decl, (FunDecl, LazyFunDecl)):
+                self.functions[decl.name] = decl
+        for name, decl in self.functions.items():
+            if isinstance(decl, LazyFunDecl):
+                self.functions[name] = decl.materialize()
+        self.index = {name: i for i, name in enumerate(self.functions)}
+        self.global_decls = global_init_order(program, self.functions)
+        self._check_init_order(program)
+        self.globals = {decl.name: f"mc_gl_{i}" for i, decl in enumerate(self.global_decls)}
+        self.lines = []
+        self.scopes = []
+        self.counter = 0
+        self._check_scoping()
+
+    def _check_init_order(self, program):
+        # um ciclo entre globais que passa por chamadas de função só é erro
+        # se a global for lida antes de ter valor, o que o código nativo não
+        # verifica
+        _, direct, indirect = global_dependencies(program, self.functions)
+        initialized = set()
+        for decl in self.global_decls:
+            if not (direct[decl.name] | indirect[decl.name]) <= initialized:
+                raise NativeUnsupported(
+                    f"dependência circular na inicialização da variável global '{decl.name}'"
+                )
+            initialized.add(decl.name)
+
+    def _check_scoping(self):
+        # o Interpreter cria o escopo de uma função dentro do escopo de quem
+        # a chamou, então um nome livre pode se referir a uma variável local
+        # de uma função que está mais acima na pilha de chamadas; em C os
+        # nomes livres só podem ser globais. main entra como as demais: o
+        # corpo dela é avaliado no próprio contexto global
+        free = {}
+        callers = {name: set() for name in self.functions}
+        for name, func in self.functions.items():
+            free[name], calls = free_names(func)
+            for call in calls:
+                if call in callers:
+                    callers[call].add(name)
+        declared = {name: _declared_names(func) for name, func in self.functions.items()}
+        for name, func in self.functions.items():
+            # declarações de todas as funções que podem chamar func,
+            # direta ou indiretamente
+            visible = set()
+            pending = list(callers[name])
+            seen = set(pending)
+            while pending:
+                caller = pending.pop()
+                visible |= declared[caller]
+                for other in callers[caller] - seen:
+                    seen.add(other)
+                    pending.append(other)
+            shadowed = free[name] & visible
+            if shadowed:
+                raise NativeUnsupported(
+                    f"a função '{func.name}' depende de escopo dinâmico: {', '.join(sorted(shadowed))}"
+                )
+
+    def _fresh(self, prefix):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def _emit(self, line):
+        self.lines.append("    " * len(self.scopes) + line)
+
+    def _temp(self, value):
+        name = self._fresh("t")
+        self._emit(f"mc_val {name} = {value};")
+        return name
+
+    def _fail(self, code=1):
+        self._emit(f"mc_fail({code});")
+        return "mc_int(0)"
+
+    def _resolve(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return self.globals.get(name)
+
+    def generate(self):
+        out = [RUNTIME, f"#define MC_MAX_DEPTH {MAX_DEPTH}\n"]
+        for name in self.globals.values():
+            out.append(f"static mc_val {name};\n")
+        for name, func in self.functions.items():
+            out.append(f"static mc_val {self._signature(func)};\n")
+        out.append("\n")
+
+        for name, func in self.functions.items():
+            out.append(self._function(func))
+
+        out.append(self._init_globals())
+        out.append(self._entry())
+        return "".join(out)
+
+    def _signature(self, func, params=None):
+        if params is None:
+            params = [f"mc_val p{i}" for i in range(len(func.params))]
+        return f"mc_fn_{self.index[func.name]}({', '.join(params) or 'void'})"
+
+    def _function(self, func):
+        self.lines = []
+        scope = {}
+        params = []
+        for param in func.params:
+            cname = self._fresh(f"p_{param.name}_")
+            scope[param.name] = cname
+            params.append(f"mc_val {cname}")
+        self.scopes = [scope]
+        # o corpo compartilha o escopo dos parâmetros
+        for stmt in func.body.stmts:
+            self._stmt(stmt)
+        self._emit("return mc_none();")
+        self.scopes = []
+        body = "\n".join(self.lines)
+        return f"static mc_val {self._signature(func, params)} {{\n{body}\n}}\n\n"
+
+    def _init_globals(self):
+        self.lines = []
+        self.scopes = [{}]
+        for name in self.globals.values():
+            self._emit(f"{name} = mc_int(0);")
+        for decl in self.global_decls:
+            if decl.init is not None:
+                value = self._expr(decl.init)
+                self._emit(f"{self.globals[decl.name]} = {value};")
+        self.scopes = []
+        body = "\n".join(self.lines)
+        return f"static void mc_init_globals(void) {{\n{body}\n}}\n\n"
+
+    def _entry(self):
+        cases = []
+        for name, func in self.functions.items():
+            args = ", ".join(
+                f"(ak[{i}] == MC_BOOL ? mc_bool(av[{i}]) : mc_int(av[{i}]))"
+                for i in range(len(func.params))
+            )
+            cases.append(f"    case {self.index[name]}: r = mc_fn_{self.index[name]}({args}); break;")
+        return (
+            "int mc_run(int fn, const long long *av, const int *ak, long long *rv, int *rk) {\n"
+            "    mc_val r;\n"
+            "    int code;\n"
+            "    mc_out_len = 0;\n"
+            "    mc_depth = 0;\n"
+            "    code = setjmp(mc_jmp);\n"
+            "    if (code) return code;\n"
+            "    mc_init_globals();\n"
+            "    switch (fn) {\n"
+            + "\n".join(cases) + "\n"
+            "    default: return MC_RUNTIME_ERROR;\n"
+            "    }\n"
+            "    *rv = r.v;\n"
+            "    *rk = r.k;\n"
+            "    return 0;\n"
+            "}\n"
+        )
+
+    def _body(self, stmt):
+        if isinstance(stmt, VarDecl):
+            # no Interpreter a declaração iria para o escopo de fora
+            raise NativeUnsupported("declaração como corpo de if/while")
+        self._emit("{")
+        self.scopes.append({})
+        self._stmt(stmt)
+        self.scopes.pop()
+        self._emit("}")
+
+    def _stmt(self, node):
+        if isinstance(node, VarDecl):
+            # o inicializador é avaliado antes de o nome existir no escopo
+            value = self._expr(node.init) if node.init is not None else "mc_int(0)"
+            cname = self._fresh(f"v_{node.name}_")
+            self._emit(f"mc_val {cname} = {value};")
+            self.scopes[-1][node.name] = cname
+        elif isinstance(node, Block):
+            self._emit("{")
+            self.scopes.append({})
+            for stmt in node.stmts:
+                self._stmt(stmt)
+            self.scopes.pop()
+            self._emit("}")
+        elif isinstance(node, ExprStmt):
+            self._expr(node.expr)
+        elif isinstance(node, IfStmt):
+            cond = self._expr(node.condition)
+            self._emit(f"if (mc_truth({cond}))")
+            self._body(node.then_stmt)
+            if node.else_stmt:
+                self._emit("else")
+                self._body(node.else_stmt)
+        elif isinstance(node, WhileStmt):
+            self._emit("while (1) {")
+            self.scopes.append({})
+            cond = self._expr(node.condition)
+            self._emit(f"if (!mc_truth({cond})) break;")
+            self._body(node.body)
+            self.scopes.pop()
+            self._emit("}")
+        elif isinstance(node, Return):
+            value = self._expr(node.expr) if node.expr else "mc_int(0)"
+            self._emit(f"return {value};")
+        else:
+            raise NativeUnsupported(f"comando não suportado: {type(node).__name__}")
+
+    def _expr(self, node):
+        # cada subexpressão vai para um temporário, na mesma ordem de
+        # avaliação do Interpreter (esquerda para a direita)
+        if isinstance(node, Int):
+            if isinstance(node.value, bool) or not INT_MIN <= node.value <= INT_MAX:
+                raise NativeUnsupported(f"literal inteiro fora de 64 bits: {node.value}")
+            return f"mc_int({node.value}LL)"
+        if isinstance(node, Bool):
+            return f"mc_bool({int(bool(node.value))})"
+        if isinstance(node, Var):
+            cname = self._resolve(node.name)
+            if cname is None:
+                return self._fail()
+            return self._temp(cname)
+        if isinstance(node, Assign):
+            value = self._expr(node.value)
+            cname = self._resolve(node.name)
+            if cname is None:
+                return self._fail()
+            self._emit(f"{cname} = {value};")
+            return value
+        if isinstance(node, BinOp):
+            left = self._expr(node.left)
+            right = self._expr(node.right)
+            helper = _BINARY.get(str(node.operator))
+            if helper is None:
+                return self._fail()
+            return self._temp(f"{helper}({left}, {right})")
+        if isinstance(node, UnaryOp):
+            operand = self._expr(node.operand)
+            helper = _UNARY.get(str(node.operator))
+            if helper is None:
+                return self._fail()
+            return self._temp(f"{helper}({operand})")
+        if isinstance(node, Function):
+            args = [self._expr(arg) for arg in node.args]
+            func = self.functions.get(node.name)
+            if func is None or len(func.params) != len(args):
+                return self._fail()
+            self._emit("MC_ENTER();")
+            result = self._temp(f"mc_fn_{self.index[node.name]}({', '.join(args)})")
+            self._emit("MC_LEAVE();")
+            return result
+        if isinstance(node, Print):
+            value = self._expr(node.expr)
+            self._emit(f"mc_print({value});")
+            return value
+        raise NativeUnsupported(f"expressão não suportada: {type(node).__name__}")
+
+
+class NativeError(Exception):
+    """
+    Erro em tempo de execução no código nativo; a chamada deve ser refeita
+    no interpretador.
+    """
+
+
+def find_compiler():
+    compiler = os.environ.get("CC")
+    if compiler:
+        return shutil.which(compiler)
+    for name in ("cc", "gcc", "clang"):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def cache_dir():
+    path = os.environ.get("MICROC_CACHE_DIR")
+    if not path:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        path = os.path.join(base, "microc")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def build(source, compiler):
+    """
+    Compila o código C `source` e devolve o caminho da biblioteca
+    compartilhada, reaproveitando a do cache se o mesmo código já foi
+    compilado. Levanta NativeUnsupported se a compilação falhar.
+    """
+    key = hashlib.sha256("\0".join([source, compiler] + CFLAGS).encode()).hexdigest()
+    directory = cache_dir()
+    library = os.path.join(directory, f"{key}.so")
+    if os.path.exists(library):
+        return library
+
+    # arquivos temporários próprios: compilações concorrentes do mesmo
+    # código nunca leem um .c escrito pela metade
+    fd, c_file = tempfile.mkstemp(suffix=".c", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(source)
+    fd, partial = tempfile.mkstemp(suffix=".so", dir=directory)
+    os.close(fd)
+    try:
+        result = subprocess.run(
+            [compiler, *CFLAGS, "-o", partial, c_file],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise NativeUnsupported(f"falha ao compilar o código gerado:\n{result.stderr}")
+        try:
+            ctypes.CDLL(partial).mc_run
+        except (OSError, AttributeError) as e:
+            raise NativeUnsupported(f"biblioteca compilada inválida: {e}")
+        # a troca é atômica, então processos concorrentes nunca carregam
+        # uma biblioteca pela metade
+        os.replace(partial, library)
+    finally:
+        os.remove(c_file)
+        if os.path.exists(partial):
+            os.remove(partial)
+    return library
+
+
+# o estado de execução (globais, buffer de saída, jmp_buf e profundidade)
+# é estático na biblioteca, e o dlopen devolve o mesmo handle para o mesmo
+# arquivo; por isso as chamadas são serializadas por biblioteca, não por
+# NativeProgram
+_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _library_lock(library):
+    key = os.path.realpath(library)
+    with _LOCKS_GUARD:
+        lock = _LOCKS.get(key)
+        if lock is None:
+            lock = _LOCKS[key] = threading.Lock()
+        return lock
+
+
+class NativeProgram:
+    """
+    Programa carregado de uma biblioteca compilada pelo backend nativo. Cada
+    chamada começa com as globais recém-inicializadas, como em eval.
+    """
+
+    def __init__(self, program, library):
+        self.program = program
+        self.functions = {}
+        for decl in program.declarations:
+            if isinstance(decl, (FunDecl, LazyFunDecl)):
+                self.functions[decl.name] = decl
+        self.index = {name: i for i, name in enumerate(self.functions)}
+        self.lib = ctypes.CDLL(library)
+        self.lib.mc_run.argtypes = [
+            ctypes.c_int,
+            ctypes.POINTER(ctypes.c_longlong),
+            ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_longlong),
+            ctypes.POINTER(ctypes.c_int),
+        ]
+        self.lib.mc_run.restype = ctypes.c_int
+        self.lib.mc_output_data.restype = ctypes.c_void_p
+        self.lib.mc_output_size.restype = ctypes.c_size_t
+        self.lock = _library_lock(library)
+
+    def call(self, name, *args):
+        """
+        Chama a função `name` e devolve (resultado, texto impresso). Levanta
+        NativeError se a chamada precisar ser refeita no interpretador.
+        """
+        if name not in self.index:
+            raise NativeError(f"função não encontrada: {name}")
+        values = (ctypes.c_longlong * max(1, len(args)))()
+        kinds = (ctypes.c_int * max(1, len(args)))()
+        for i, arg in enumerate(args):
+            if not isinstance(arg, int) or not INT_MIN <= arg <= INT_MAX:
+                raise NativeError(f"argumento não suportado: {arg!r}")
+            values[i] = int(arg)
+            kinds[i] = BOOL if isinstance(arg, bool) else INT
+        result = ctypes.c_longlong()
+        kind = ctypes.c_int()
+        with self.lock:
+            code = self.lib.mc_run(self.index[name], values, kinds, ctypes.byref(result), ctypes.byref(kind))
+            if code != 0:
+                raise NativeError(ERRORS.get(code, f"erro {code}"))
+            size = self.lib.mc_output_size()
+            output = ctypes.string_at(self.lib.mc_output_data(), size).decode() if size else ""
+        if kind.value == BOOL:
+            return bool(result.value), output
+        if kind.value == NONE:
+            return None, output
+        return result.value, output
+
+    def run(self):
+        if 'main' not in self.functions:
+            raise NativeError("função main não encontrada")
+        if self.functions['main'].params:
+            # Interpreter.run não associa os parâmetros de main
+            raise NativeError("main com parâmetros")
+        return self.call('main')
+
+
+def _fallback(reason):
+    print(f"backend nativo: usando o interpretador ({reason})", file=sys.stderr)
+
+
+def load(program):
+    """
+    Gera, compila (ou busca no cache) e carrega o programa. Devolve None,
+    avisando o motivo em stderr, se não houver compilador C ou se o
+    programa não puder ser traduzido.
+    """
+    compiler = find_compiler()
+    if compiler is None:
+        _fallback("nenhum compilador C encontrado")
+        return None
+    try:
+        source = CGenerator(program).generate()
+        library = build(source, compiler)
+    except NativeUnsupported as e:
+        _fallback(e)
+        return None
+    return NativeProgram(program, library)
+
+
+def run(native, out=None):
+    """
+    Executa main de um NativeProgram e escreve a saída de print em `out`
+    (padrão: sys.stdout). Se o código nativo falhar, o motivo é avisado em
+    stderr e o programa é executado do início no interpretador, como em
+    Interpreter.visit_program.
+    """
+    from .node import Interpreter
+
+    try:
+        result, output = native.run()
+    except NativeError as e:
+        _fallback(e)
+        interpreter = Interpreter(native.program, out=out)
+        return interpreter.visit_program(native.program)
+    (out if out is not None else sys.stdout).write(output)
+    return result
+
+
+def _interpret(program):
+    # devolve (saída, exceção levantada ou None)
+    from .node import Interpreter
+
+    buffer = io.StringIO()
+    try:
+        result = Interpreter(program, out=buffer).visit_program(program)
+    except Exception as e:
+        return f"{buffer.getvalue()}<{type(e).__name__}>", e
+    return f"{buffer.getvalue()}{result}\n", None
+
+
+def differential_check(paths):
+    """
+    Executa cada arquivo no interpretador e no backend nativo (sem
+    recorrer ao interpretador) e compara as saídas. Devolve o número de
+    divergências; arquivos com erro de sintaxe ou semântico e a diferença
+    aceita de recursão (veja o início do módulo) são apenas relatados.
+    """
+    from .parser import parse
+    from .transformer import MicroCTransformer
+
+    compiler = find_compiler()
+    if compiler is None:
+        print("nenhum compilador C encontrado", file=sys.stderr)
+        return 1
+
+    mismatches = 0
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                program = MicroCTransformer().transform(parse(f.read()))
+        except ParseError as e:
+            print(f"{path}: erro de sintaxe ({e})")
+            continue
+        expected, error = _interpret(program)
+        try:
+            native = NativeProgram(program, build(CGenerator(program).generate(), compiler))
+            result, output = native.run()
+        except SemanticError as e:
+            print(f"{path}: erro semântico ({e})")
+            continue
+        except (NativeUnsupported, NativeError) as e:
+            print(f"{path}: interpretador ({e})")
+            continue
+        actual = f"{output}{result}\n"
+        if actual == expected:
+            print(f"{path}: ok")
+        elif isinstance(error, RecursionError):
+            print(f"{path}: diferença aceita (RecursionError no interpretador)")
+        else:
+            mismatches += 1
+            print(f"{path}: DIVERGENTE\n  interpretador: {expected!r}\n  nativo: {actual!r}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(1 if differential_check(sys.argv[1:]) else 0)
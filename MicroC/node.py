@@ -1,6 +1,10 @@
 from .ast import *
 from .ctx import *
 from .errors import *
+from .analysis import global_init_order
+
+# valor das globais cujo inicializador ainda não terminou
+UNINITIALIZED = object()
 
 class ReturnValue(Exception):
     def __init__(self, value):
@@ -10,39 +14,64 @@ class Interpreter:
     def visit_bool_literal(self, node):
         return node.value
 
-    def __init__(self, program):
+    def __init__(self, program, env=None, functions=None, out=None):
         self.program = program
+        # destino das chamadas a print; None usa sys.stdout
+        self.out = out
 
-        self.env = Ctx()
+        if functions is None:
+            self.functions = {}
+            self._register_functions(program)
+        else:
+            self.functions = functions
 
-        self.functions = {}
-        self._register_functions(program)
+        if env is None:
+            self.env = Ctx()
+            self._init_globals(program)
+        else:
+            self.env = env
 
     def _register_functions(self, program):
         for decl in program.declarations:
-            if isinstance(decl, FunDecl):
+            if isinstance(decl, (FunDecl, LazyFunDecl)):
                 self.functions[decl.name] = decl
-            elif isinstance(decl, VarDecl):
-                if decl.init is not None:
-                    value = decl.init.eval(self) if hasattr(decl.init, 'eval') else decl.init
-                else:
-                    value = 0
-                self.env.set(decl.name, value)
+
+    def _init_globals(self, program):
+        # cada inicializador é avaliado uma única vez, em ordem de
+        # dependência; o contexto global guarda apenas valores prontos.
+        # Ciclos que passam por chamadas de função só são erro se a global
+        # for de fato lida antes de ter valor (veja visit_variable)
+        order = global_init_order(program, self.functions)
+        for decl in order:
+            self.env.set(decl.name, UNINITIALIZED)
+        for decl in order:
+            value = decl.init.eval(self) if decl.init is not None else 0
+            self.env.set(decl.name, value)
 
     def run(self):
         if 'main' not in self.functions:
             raise KeyError('main')
-        func = self.functions['main']
+        func = self._function('main')
         try:
             result = self._eval_block(func.body, self.env)
         except ReturnValue as rv:
             result = rv.value
         return result
 
-    def _call_function(self, name, args):
+    def _function(self, name):
         func = self.functions.get(name)
         if not func:
             raise KeyError(name)
+        if func.__class__ is LazyFunDecl:
+            # primeira chamada: converte o corpo e guarda a função pronta;
+            # o dicionário pode ser compartilhado entre threads (veja
+            # CompiledProgram), por isso a escrita fica sob o mesmo lock
+            with func.lock:
+                func = self.functions[name] = func.materialize()
+        return func
+
+    def _call_function(self, name, args):
+        func = self._function(name)
         
         if len(args) != len(func.params):
             raise KeyError(name, len(func.params), len(args))
@@ -68,14 +97,10 @@ class Interpreter:
             self.env = prev_env
 
     def visit_program(self, node):
-        for decl in node.declarations:
-            if isinstance(decl, FunDecl):
-                self.functions[decl.name] = decl
-            elif isinstance(decl, VarDecl):
-                value = decl.init if decl.init is not None else 0
-                self.env.set(decl.name, value)
-            else:
-                decl.eval(self)
+        if node is not self.program:
+            self.program = node
+            self._register_functions(node)
+            self._init_globals(node)
 
         return self.run()
 
@@ -151,13 +176,15 @@ class Interpreter:
     
     def visit_print_call(self, node):
         value = node.expr.eval(self)
-        print(value)
+        print(value, file=self.out)
         return value
 
     def visit_variable(self, node):
         value = self.env.get(node.name)
-        while hasattr(value, "eval"):
-            value = value.eval(self)
+        if value is UNINITIALIZED:
+            raise SemanticError(
+                f"dependência circular na inicialização da variável global '{node.name}'"
+            )
         return value
 
     def visit_int_literal(self, node):
@@ -1,6 +1,8 @@
 from lark import Lark, UnexpectedInput
 import os
 
+from .errors import ParseError
+
 GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), 'grammar.lark')
 
 with open(GRAMMAR_PATH, encoding='utf-8') as f:
@@ -8,10 +10,15 @@ with open(GRAMMAR_PATH, encoding='utf-8') as f:
 
 parser = Lark(GRAMMAR, parser='lalr', start='start', propagate_positions=True)
 
-def parse_source(source: str):
+def parse(source: str):
     try:
-        tree = parser.parse(source)
-        return tree
+        return parser.parse(source)
     except UnexpectedInput as e:
-        print('Erro de sintaxe:', e)
+        raise ParseError(f'Erro de sintaxe: {e}') from e
+
+def parse_source(source: str):
+    try:
+        return parse(source)
+    except ParseError as e:
+        print(e)
         return None
\ No newline at end of file
@@ -0,0 +1,90 @@
+import io
+import threading
+
+from .ctx import Ctx
+from .node import Interpreter
+
+
+class _NullOutput:
+    """
+    Destino de print que descarta tudo o que recebe.
+    """
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+NULL_OUTPUT = _NullOutput()
+
+
+class GlobalState:
+    """
+    Conjunto de variáveis globais que persiste entre chamadas a um
+    CompiledProgram. Chamadas que compartilham o mesmo estado são
+    serializadas pelo lock.
+    """
+
+    def __init__(self, values):
+        self.env = Ctx()
+        self.env.vars = dict(values)
+        self.lock = threading.Lock()
+
+    @property
+    def values(self):
+        return dict(self.env.vars)
+
+
+class CompiledProgram:
+    """
+    Programa Micro-C já analisado, transformado e preparado, pronto para ser
+    chamado várias vezes sem refazer o parse.
+
+    As funções e os valores iniciais das globais são calculados uma única
+    vez. Cada chamada usa um Interpreter próprio, então chamadas
+    concorrentes (por exemplo, de um pool de threads) não interferem entre
+    si. Por padrão cada chamada recebe uma cópia nova das globais e a saída
+    de print é descartada.
+    """
+
+    def __init__(self, program, out=None):
+        self.program = program
+        loader = Interpreter(program, out=out if out is not None else NULL_OUTPUT)
+        self.functions = loader.functions
+        self.globals = dict(loader.env.vars)
+
+    def new_state(self):
+        return GlobalState(self.globals)
+
+    def call(self, name, *args, state=None, out=None):
+        """
+        Chama a função `name` com `args`. Sem `state`, a chamada usa uma
+        cópia nova das globais; com um GlobalState (veja new_state), as
+        alterações feitas nas globais ficam guardadas nele. A saída de print
+        vai para `out` (um arquivo de texto) ou é descartada.
+        """
+        if out is None:
+            out = NULL_OUTPUT
+        if state is None:
+            env = Ctx()
+            env.vars = dict(self.globals)
+            return self._call(name, args, env, out)
+        with state.lock:
+            return self._call(name, args, state.env, out)
+
+    def capture(self, name, *args, state=None):
+        """
+        Como call, mas devolve também tudo o que a função imprimiu.
+        """
+        buffer = io.StringIO()
+        result = self.call(name, *args, state=state, out=buffer)
+        return result, buffer.getvalue()
+
+    def run(self, state=None, out=None):
+        return self.call('main', state=state, out=out)
+
+    def _call(self, name, args, env, out):
+        interpreter = Interpreter(self.program, env=env, functions=self.functions, out=out)
+        return interpreter._call_function(name, list(args))
@@ -0,0 +1,151 @@
+import gc
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+from .ast import FunDecl, LazyFunDecl, Program
+from .analysis import iter_nodes, max_scope_depth
+
+
+class PhaseStats:
+    """
+    Medidas de uma etapa da execução (parse, transformação, carga ou
+    execução).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        # None quando a memória não foi medida
+        self.peak_memory = None
+        self.objects = 0
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "peak_memory": self.peak_memory,
+            "objects": self.objects,
+        }
+
+
+class Stats:
+    """
+    Estatísticas de uma execução do interpretador: tempo de parede, tempo de
+    CPU e variação no número de objetos de cada etapa, além de métricas do
+    programa (nós da ast, funções e profundidade máxima de escopos).
+
+    Com --lazy, os corpos das funções que ainda não foram convertidos não
+    entram nos nós nem na profundidade de escopos; `lazy_functions` diz
+    quantas funções ficaram de fora.
+
+    Com `memory`, o pico de memória de cada etapa também é medido com o
+    tracemalloc. O tracemalloc deixa as etapas bem mais lentas, então os
+    tempos medidos junto com a memória não servem para comparar etapas;
+    para isso, meça o tempo em uma execução sem `memory`.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.phases = []
+        self.nodes = 0
+        self.functions = 0
+        self.lazy_functions = 0
+        self.max_scope_depth = 0
+
+    @contextmanager
+    def phase(self, name):
+        stats = PhaseStats(name)
+        # a contagem de objetos aloca uma lista grande, por isso fica fora
+        # da janela medida
+        objects = len(gc.get_objects())
+        started_tracing = False
+        if self.memory:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield stats
+        finally:
+            stats.wall_time = time.perf_counter() - wall
+            stats.cpu_time = time.process_time() - cpu
+            if self.memory:
+                stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            stats.objects = len(gc.get_objects()) - objects
+            self.phases.append(stats)
+
+    def record_program(self, program):
+        # funções preguiçosas já convertidas são medidas pelo corpo
+        # convertido; as demais só contam como declaração
+        declarations = []
+        self.lazy_functions = 0
+        for decl in program.declarations:
+            if isinstance(decl, LazyFunDecl):
+                fun = decl.materialized
+                if fun is None:
+                    self.lazy_functions += 1
+                else:
+                    decl = fun
+            declarations.append(decl)
+        program = Program(declarations)
+
+        self.nodes = 0
+        self.functions = 0
+        for node in iter_nodes(program):
+            self.nodes += 1
+            if isinstance(node, (FunDecl, LazyFunDecl)):
+                self.functions += 1
+        self.max_scope_depth = max_scope_depth(program)
+
+    def as_dict(self):
+        return {
+            "memory": self.memory,
+            "phases": [phase.as_dict() for phase in self.phases],
+            "total_wall_time": sum(phase.wall_time for phase in self.phases),
+            "total_cpu_time": sum(phase.cpu_time for phase in self.phases),
+            "nodes": self.nodes,
+            "functions": self.functions,
+            "lazy_functions": self.lazy_functions,
+            "max_scope_depth": self.max_scope_depth,
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
+
+    def format(self):
+        lines = [f"{'etapa':<12} {'parede (ms)':>12} {'cpu (ms)':>12} {'pico (KiB)':>12} {'objetos':>10}"]
+        for phase in self.phases:
+            peak = "-" if phase.peak_memory is None else f"{phase.peak_memory / 1024:.1f}"
+            lines.append(
+                f"{phase.name:<12} {phase.wall_time * 1000:>12.3f} {phase.cpu_time * 1000:>12.3f} "
+                f"{peak:>12} {phase.objects:>10}"
+            )
+        data = self.as_dict()
+        lines.append(
+            f"{'total':<12} {data['total_wall_time'] * 1000:>12.3f} {data['total_cpu_time'] * 1000:>12.3f}"
+        )
+        partial = ""
+        if self.lazy_functions:
+            partial = f" (sem os corpos de {self.lazy_functions} funções ainda não convertidas)"
+        lines.append(f"nós da ast: {self.nodes}{partial}")
+        lines.append(f"funções: {self.functions}")
+        lines.append(f"profundidade máxima de escopo: {self.max_scope_depth}{partial}")
+        return "\n".join(lines)
+
+
+def phase(stats, name):
+    """
+    Mede a etapa `name` quando há um objeto de estatísticas; caso contrário
+    não faz nada.
+    """
+    if stats is None:
+        return nullcontext()
+    return stats.phase(name)
@@ -1,4 +1,4 @@
-from lark import Transformer, Token
+from lark import Transformer, Token, Tree
 from .ast import *
 
 
@@ -25,6 +25,23 @@ class MicroCTransformer(Transformer):
     
     def program(self, items):
         return Program(items)
+
+    def transform_lazy(self, tree):
+        """
+        Como transform, mas mantém o corpo de cada função como subárvore do
+        Lark dentro de um LazyFunDecl; o corpo só vira ast quando a função
+        é chamada pela primeira vez.
+        """
+        declarations = []
+        for child in tree.children:
+            if isinstance(child, Tree) and child.data == 'fun_decl':
+                type_tree, name, params, body = child.children
+                declarations.append(LazyFunDecl(
+                    self.transform(type_tree), str(name), self.transform(params), body,
+                ))
+            else:
+                declarations.append(self.transform(child))
+        return Program(declarations)
     
     def var_decl(self, items):
         type_str = items[0]
@@ -154,7 +171,7 @@ class MicroCTransformer(Transformer):
     
     def print_call(self, items):
         expr = self.ast_converter(items[0])
-        return Print(expression=expr)
+        return Print(expr)
         
     
     def args(self, items):
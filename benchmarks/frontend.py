@@ -0,0 +1,179 @@
+"""
+Mede como as etapas iniciais do interpretador (parse_source,
+MicroCTransformer.transform, Interpreter._register_functions e a
+inicialização das globais) escalam com o tamanho do programa, usando
+programas sintéticos de MicroC.generator.
+
+    python benchmarks/frontend.py --vary functions --sizes 10 20 40 80 160
+    python benchmarks/frontend.py --vary expr-size --shape right --plot right.png
+
+Imprime uma tabela csv com tempo e pico de memória de cada etapa e, ao
+final, o expoente estimado do crescimento (inclinação em escala log-log).
+Expoentes bem acima de 1 indicam comportamento super-linear. Falhas como
+RecursionError são registradas na tabela em vez de interromper a medição.
+"""
+import argparse
+import csv
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from MicroC.ctx import Ctx
+from MicroC.generator import SHAPES, generate_program
+from MicroC.node import Interpreter
+from MicroC.parser import parse
+from MicroC.stats import Stats
+from MicroC.transformer import MicroCTransformer
+
+PHASES = ("parse", "transform", "register", "globals")
+
+DIMENSIONS = {
+    "functions": "functions",
+    "depth": "depth",
+    "expr-size": "expr_size",
+    "globals": "globals",
+}
+
+# expoente a partir do qual uma etapa é marcada como super-linear
+SUPERLINEAR = 1.3
+
+
+def measure(source, memory=False):
+    """
+    Executa as etapas iniciais sobre `source` e devolve (Stats, erro), onde
+    erro é a descrição da primeira exceção levantada ou None.
+    """
+    stats = Stats(memory=memory)
+    try:
+        with stats.phase("parse"):
+            tree = parse(source)
+        with stats.phase("transform"):
+            ast = MicroCTransformer().transform(tree)
+        stats.record_program(ast)
+        with stats.phase("register"):
+            interpreter = Interpreter(ast, env=Ctx())
+        with stats.phase("globals"):
+            interpreter._init_globals(ast)
+    except Exception as e:
+        # o Lark embrulha exceções dos callbacks (como RecursionError) em
+        # VisitError
+        e = getattr(e, "orig_exc", e)
+        return stats, f"{type(e).__name__}: {e}".splitlines()[0]
+    return stats, None
+
+
+def growth_exponent(points):
+    """
+    Inclinação da reta de mínimos quadrados em escala log-log.
+    """
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def plot(rows, dimension, path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib não está instalado; o gráfico não foi gerado.", file=sys.stderr)
+        return
+
+    fig, (time_ax, memory_ax) = plt.subplots(1, 2, figsize=(12, 5))
+    for name in PHASES:
+        points = [(row["bytes"], row) for row in rows if row["phase"] == name and not row["error"]]
+        if not points:
+            continue
+        xs = [x for x, _ in points]
+        time_ax.plot(xs, [row["wall_ms"] for _, row in points], marker="o", label=name)
+        memory_ax.plot(xs, [row["peak_kib"] for _, row in points], marker="o", label=name)
+    for ax, label in ((time_ax, "tempo (ms)"), (memory_ax, "pico de memória (KiB)")):
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel(f"tamanho do fonte (bytes), variando {dimension}")
+        ax.set_ylabel(label)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"gráfico salvo em {path}", file=sys.stderr)
+
+
+def make_argparser():
+    parser = argparse.ArgumentParser(description="Benchmark de escala das etapas iniciais do Micro-C")
+    parser.add_argument("--vary", choices=DIMENSIONS, default="functions", help="Parâmetro do gerador que cresce.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 40, 80, 160], help="Valores do parâmetro variado.")
+    parser.add_argument("--seed", type=int, default=0, help="Semente do gerador.")
+    parser.add_argument("--functions", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--expr-size", type=int, default=4)
+    parser.add_argument("--globals", type=int, default=5)
+    parser.add_argument("--statements", type=int, default=3)
+    parser.add_argument("--shape", choices=SHAPES, default="flat")
+    parser.add_argument("--plot", default=None, help="Arquivo png com os gráficos (requer matplotlib).")
+    return parser
+
+
+def main():
+    args = make_argparser().parse_args()
+    options = {
+        "functions": args.functions,
+        "depth": args.depth,
+        "expr_size": args.expr_size,
+        "globals": args.globals,
+        "statements": args.statements,
+        "shape": args.shape,
+    }
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow([args.vary, "bytes", "nodes", "phase", "wall_ms", "cpu_ms", "peak_kib", "error"])
+    rows = []
+    for size in args.sizes:
+        options[DIMENSIONS[args.vary]] = size
+        source = generate_program(args.seed, **options)
+        # tempo e memória em execuções separadas: o tracemalloc distorce
+        # os tempos
+        stats, error = measure(source)
+        memory, _ = measure(source, memory=True)
+        peaks = {phase.name: phase.peak_memory for phase in memory.phases}
+        for i, phase in enumerate(stats.phases):
+            # se houve erro, ele aconteceu na última etapa medida
+            failed = error if error and i == len(stats.phases) - 1 else ""
+            row = {
+                "size": size,
+                "bytes": len(source),
+                "nodes": stats.nodes,
+                "phase": phase.name,
+                "wall_ms": phase.wall_time * 1000,
+                "cpu_ms": phase.cpu_time * 1000,
+                "peak_kib": (peaks.get(phase.name) or 0) / 1024,
+                "error": failed,
+            }
+            rows.append(row)
+            writer.writerow([size, row["bytes"], row["nodes"], phase.name, f"{row['wall_ms']:.3f}",
+                             f"{row['cpu_ms']:.3f}", f"{row['peak_kib']:.1f}", failed])
+        sys.stdout.flush()
+
+    print(file=sys.stderr)
+    for name in PHASES:
+        points = [(row["bytes"], row["wall_ms"]) for row in rows if row["phase"] == name and not row["error"]]
+        exponent = growth_exponent(points)
+        if exponent is None:
+            continue
+        flag = "  <- super-linear" if exponent > SUPERLINEAR else ""
+        print(f"{name:<10} tempo ~ tamanho^{exponent:.2f}{flag}", file=sys.stderr)
+
+    if args.plot:
+        plot(rows, args.vary, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from MicroC.ast import Printer
+from MicroC.dump import ELIDED, FORMATS, dump_ast, dump_cst
+from MicroC.generator import generate_program
+from MicroC.parser import parse
+from MicroC.transformer import MicroCTransformer
+
+EXAMPLES = sorted(Path(__file__).resolve().parent.parent.glob("exemplos/*.mc"))
+SOURCES = [path.read_text(encoding="utf-8") for path in EXAMPLES] + [generate_program(seed=7)]
+IDS = [path.name for path in EXAMPLES] + ["gerado"]
+
+
+def printer_text(program):
+    # Printer.visit_program antes do dump incremental
+    printer = Printer()
+    printer.indent_level = 1
+    result = "Program:\n"
+    for decl in program.declarations:
+        result += "  " + str(decl.eval(printer)) + "\n"
+    return result.rstrip()
+
+
+def ast_dump(program, format, max_depth=None):
+    out = io.StringIO()
+    dump_ast(program, out, format, max_depth)
+    return out.getvalue()
+
+
+def cst_dump(tree, format, max_depth=None):
+    out = io.StringIO()
+    dump_cst(tree, out, format, max_depth)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("source", SOURCES, ids=IDS)
+def test_text_matches_printer_and_pretty(source):
+    tree = parse(source)
+    program = MicroCTransformer().transform(tree)
+    assert ast_dump(program, "text").rstrip() == printer_text(program)
+    assert cst_dump(tree, "text") == tree.pretty()
+
+
+@pytest.mark.parametrize("max_depth", [None, 0, 1, 3])
+@pytest.mark.parametrize("source", SOURCES, ids=IDS)
+def test_json_is_valid_and_compact(source, max_depth):
+    tree = parse(source)
+    program = MicroCTransformer().transform(tree)
+    for text in (ast_dump(program, "json", max_depth), cst_dump(tree, "json", max_depth)):
+        assert text.endswith("\n")
+        assert text[:-1] == json.dumps(json.loads(text), separators=(",", ":"))
+
+
+def test_ast_elision_depth():
+    program = MicroCTransformer().transform(parse("int g; int main() { return 1; }"))
+    data = json.loads(ast_dump(program, "json", max_depth=1))
+    assert data["node"] == "Program"
+    var_decl, fun_decl = data["declarations"]
+    assert var_decl == {"node": "VarDecl", "type": "int", "name": "g", "init": None}
+    assert fun_decl["node"] == "FunDecl" and fun_decl["name"] == "main"
+    assert fun_decl["body"] == ELIDED
+
+    data = json.loads(ast_dump(program, "json", max_depth=0))
+    assert data["declarations"] == [ELIDED, ELIDED]
+
+    text = ast_dump(program, "text", max_depth=1)
+    assert text.splitlines()[2] == "  FunDecl(int main())"
+    assert text.splitlines()[3] == f"    {ELIDED}"
+
+
+def test_cst_elision_depth():
+    tree = parse("int main() { return 1; }")
+    data = json.loads(cst_dump(tree, "json", max_depth=1))
+    assert data["rule"] == "program"
+    fun_decl = data["children"][0]
+    assert fun_decl["rule"] == "fun_decl"
+    assert {"token": "ID", "value": "main"} in fun_decl["children"]
+    assert all(child == ELIDED for child in fun_decl["children"] if "token" not in child)
+
+    assert cst_dump(tree, "sexp", max_depth=0) == f"(program {ELIDED})\n"
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_deep_trees_do_not_hit_recursion_limit(format):
+    expr = "1" + " + 1" * 5000
+    source = f"int main() {{ return {expr}; }}"
+    tree = parse(source)
+    assert cst_dump(tree, format)
+
+
+@pytest.mark.parametrize("max_depth", [None, 0, 2])
+@pytest.mark.parametrize("source", SOURCES, ids=IDS)
+def test_sexp_is_balanced(source, max_depth):
+    tree = parse(source)
+    program = MicroCTransformer().transform(tree)
+    for text in (ast_dump(program, "sexp", max_depth), cst_dump(tree, "sexp", max_depth)):
+        depth = 0
+        for char in text:
+            depth += {"(": 1, ")": -1}.get(char, 0)
+            assert depth >= 0
+        assert depth == 0 and text.count("\n") == 1
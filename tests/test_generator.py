@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+from MicroC.analysis import iter_nodes
+from MicroC.ast import FunDecl
+from MicroC.generator import SHAPES, ProgramGenerator, generate_program
+from MicroC.node import Interpreter
+from MicroC.parser import parse
+from MicroC.transformer import MicroCTransformer
+
+OPTIONS = [
+    {},
+    {"functions": 0},
+    {"globals": 0},
+    {"depth": 0},
+    {"functions": 0, "globals": 0, "depth": 0},
+    {"expr_size": 1, "statements": 1},
+    {"functions": 12, "depth": 3, "expr_size": 6},
+]
+
+
+@pytest.mark.parametrize("options", OPTIONS, ids=lambda options: ",".join(f"{k}={v}" for k, v in options.items()) or "padrão")
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_generated_programs_run(seed, shape, options):
+    source = generate_program(seed=seed, shape=shape, **options)
+    program = MicroCTransformer().transform(parse(source))
+    functions = [node for node in iter_nodes(program) if isinstance(node, FunDecl)]
+    assert len(functions) == options.get("functions", 10) + 1
+
+    result = Interpreter(program, out=io.StringIO()).visit_program(program)
+    assert isinstance(result, int)
+
+
+def test_same_seed_gives_same_program():
+    assert generate_program(seed=5, shape="balanced") == generate_program(seed=5, shape="balanced")
+    assert generate_program(seed=5) != generate_program(seed=6)
+
+
+def test_unknown_shape_is_rejected():
+    with pytest.raises(ValueError):
+        ProgramGenerator(shape="zigzag")
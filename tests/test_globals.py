@@ -0,0 +1,79 @@
+import io
+
+import pytest
+
+from MicroC.errors import SemanticError
+from MicroC.node import Interpreter
+from MicroC.parser import parse
+from MicroC.transformer import MicroCTransformer
+
+
+def load(source, out=None):
+    ast = MicroCTransformer().transform(parse(source))
+    return ast, Interpreter(ast, out=out)
+
+
+def test_initializers_follow_dependencies():
+    ast, interpreter = load("""
+        int a = b + 1;
+        int b = 2;
+        int main() { return a; }
+    """)
+    assert interpreter.env.vars == {"b": 2, "a": 3}
+    assert interpreter.visit_program(ast) == 3
+
+
+def test_dependencies_through_function_calls():
+    ast, interpreter = load("""
+        int a = f();
+        int b = 40;
+        int f() { return b + 2; }
+        int main() { return a; }
+    """)
+    assert interpreter.visit_program(ast) == 42
+
+
+def test_cycle_raises_semantic_error():
+    with pytest.raises(SemanticError):
+        load("""
+            int a = b;
+            int b = a;
+            int main() { return a; }
+        """)
+
+
+def test_initializer_runs_exactly_once():
+    out = io.StringIO()
+    ast, interpreter = load("""
+        int a = print(7) + 1;
+        int main() { return a + a + a; }
+    """, out=out)
+    assert interpreter.visit_program(ast) == 24
+    assert out.getvalue() == "7\n"
+
+
+def test_globals_hold_plain_values():
+    _, interpreter = load("""
+        int a = 1 + 2;
+        int b;
+        int main() { return a; }
+    """)
+    assert interpreter.env.vars == {"a": 3, "b": 0}
+
+
+def test_cycle_through_untaken_branch_is_allowed():
+    ast, interpreter = load("""
+        int f(int n) { if (n) { return a; } return 1; }
+        int a = f(0);
+        int main() { return a; }
+    """)
+    assert interpreter.visit_program(ast) == 1
+
+
+def test_cycle_through_call_raises_when_read():
+    with pytest.raises(SemanticError):
+        load("""
+            int f(int n) { if (n) { return a; } return 1; }
+            int a = f(1);
+            int main() { return a; }
+        """)
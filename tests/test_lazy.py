@@ -0,0 +1,110 @@
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import MicroC
+from MicroC.analysis import prune_unreachable, reachable_functions
+from MicroC.ast import FunDecl, LazyFunDecl
+from MicroC.generator import generate_program
+from MicroC.node import Interpreter
+from MicroC.parser import parse
+from MicroC.transformer import MicroCTransformer
+
+EXAMPLES = sorted(Path(__file__).resolve().parent.parent.glob("exemplos/*.mc"))
+
+SOURCE = """
+    int g = helper(2);
+    int helper(int n) { return n + 1; }
+    int unused(int n) { return n * 2; }
+    int leaf(int n) { return n - 1; }
+    int middle(int n) { return leaf(n) + 10; }
+    int main() { return middle(g); }
+"""
+
+
+def lazy(source):
+    return MicroCTransformer().transform_lazy(parse(source))
+
+
+def interpret(program):
+    out = io.StringIO()
+    result = Interpreter(program, out=out).visit_program(program)
+    return result, out.getvalue()
+
+
+def functions(program):
+    return {decl.name: decl for decl in program.declarations if isinstance(decl, (FunDecl, LazyFunDecl))}
+
+
+def test_reachable_functions_follow_calls_and_globals():
+    program = lazy(SOURCE)
+    assert reachable_functions(program) == {"main", "middle", "leaf", "helper"}
+    assert reachable_functions(program, roots=["leaf"]) == {"leaf", "helper"}
+
+
+def test_prune_unreachable_drops_dead_functions():
+    program = prune_unreachable(lazy(SOURCE))
+    assert set(functions(program)) == {"helper", "leaf", "middle", "main"}
+    # a global continua no programa
+    assert program.declarations[0].name == "g"
+
+    eager = prune_unreachable(MicroCTransformer().transform(parse(SOURCE)))
+    assert set(functions(eager)) == {"helper", "leaf", "middle", "main"}
+
+
+def test_unreached_bodies_stay_unconverted():
+    program = lazy("""
+        int used() { return 1; }
+        int never() { return 2; }
+        int main() { return used(); }
+    """)
+    assert interpret(program) == (1, "")
+    decls = functions(program)
+    assert isinstance(decls["used"].materialized, FunDecl)
+    assert decls["never"].materialized is None
+    assert decls["never"].tree is not None
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.name)
+def test_transform_lazy_matches_transform(path):
+    tree = parse(path.read_text(encoding="utf-8"))
+    assert interpret(MicroCTransformer().transform_lazy(tree)) == interpret(MicroCTransformer().transform(tree))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_transform_lazy_matches_transform_on_generated_programs(seed):
+    tree = parse(generate_program(seed=seed))
+    lazy_program = MicroCTransformer().transform_lazy(tree)
+    eager_program = MicroCTransformer().transform(tree)
+    assert interpret(lazy_program) == interpret(eager_program)
+    eager = functions(eager_program)
+    for name, decl in functions(lazy_program).items():
+        assert decl.materialize() == eager[name]
+
+
+def test_concurrent_calls_on_lazy_program():
+    source = generate_program(seed=3, functions=60)
+    expected = MicroC.compile(source).capture("main")
+
+    # trocas de thread frequentes fazem várias threads converterem a mesma
+    # função ao mesmo tempo
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(5):
+            program = MicroC.compile(source, lazy=True)
+            barrier = threading.Barrier(16)
+
+            def call(_):
+                barrier.wait()
+                return program.capture("main")
+
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                results = list(pool.map(call, range(16)))
+            assert results == [expected] * 16
+    finally:
+        sys.setswitchinterval(interval)
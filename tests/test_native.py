@@ -0,0 +1,91 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from MicroC import native
+from MicroC.ast import *
+from MicroC.node import Interpreter
+from MicroC.parser import parse
+from MicroC.transformer import MicroCTransformer
+
+EXAMPLES = sorted(Path(__file__).resolve().parent.parent.glob("exemplos/*.mc"))
+
+pytestmark = pytest.mark.skipif(native.find_compiler() is None, reason="nenhum compilador C encontrado")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("MICROC_CACHE_DIR", str(tmp_path))
+
+
+def interpret(program):
+    out = io.StringIO()
+    result = Interpreter(program, out=out).visit_program(program)
+    return result, out.getvalue()
+
+
+def compile_native(program):
+    compiler = native.find_compiler()
+    return native.NativeProgram(program, native.build(native.CGenerator(program).generate(), compiler))
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.name)
+def test_examples_match_interpreter(path):
+    program = MicroCTransformer().transform(parse(path.read_text(encoding="utf-8")))
+    assert compile_native(program).run() == interpret(program)
+
+
+@pytest.mark.parametrize("left, right", [
+    (7, 2), (-7, 2), (7, -2), (-7, -2), (6, 3), (-6, 3), (0, -5), (1, 7), (-1, 7),
+])
+def test_division_rounds_like_python(left, right):
+    # o transformer converte '/' em '*', então a ast é montada à mão
+    program = Program([
+        FunDecl("int", "main", [], Block([
+            ExprStmt(Print(BinOp(Int(left), "/", Int(right)))),
+            ExprStmt(Print(BinOp(UnaryOp("-", Int(left)), "/", Int(right)))),
+            Return(BinOp(Int(left), "/", Int(right))),
+        ])),
+    ])
+    assert compile_native(program).run() == interpret(program)
+    assert interpret(program)[0] == left // right
+
+
+def test_division_by_zero_falls_back_to_interpreter():
+    program = Program([
+        FunDecl("int", "main", [], Block([Return(BinOp(Int(1), "/", Int(0)))])),
+    ])
+    with pytest.raises(native.NativeError):
+        compile_native(program).run()
+    with pytest.raises(ZeroDivisionError):
+        native.run(native.load(program), out=io.StringIO())
+
+
+def test_parameter_named_like_global_is_compiled():
+    program = MicroCTransformer().transform(parse("""
+        int x = 5;
+        int sq(int x) { return x * x; }
+        int main() { return sq(3) + x; }
+    """))
+    loaded = native.load(program)
+    assert loaded is not None
+    assert loaded.run() == interpret(program)
+
+
+def test_dynamic_scoping_falls_back_with_reason(capsys):
+    program = MicroCTransformer().transform(parse("""
+        int x = 5;
+        int g() { return x; }
+        int h() { int x = 1; return g(); }
+        int main() { return h(); }
+    """))
+    assert native.load(program) is None
+    assert "escopo dinâmico" in capsys.readouterr().err
+
+
+def test_differential_check_reports_semantic_errors(tmp_path, capsys):
+    path = tmp_path / "ciclo.mc"
+    path.write_text("int a = b; int b = a; int main() { return a; }")
+    assert native.differential_check([str(path)]) == 0
+    assert "erro semântico" in capsys.readouterr().out
@@ -0,0 +1,42 @@
+import pytest
+
+import MicroC
+from MicroC.errors import ParseError
+
+COUNTER = """
+    int count = 10;
+    int bump(int n) { count = count + n; return count; }
+    int show() { print(count); return count; }
+    int main() { return bump(1); }
+"""
+
+
+def test_calls_get_fresh_globals_by_default():
+    program = MicroC.compile(COUNTER)
+    assert program.call("bump", 5) == 15
+    assert program.call("bump", 5) == 15
+    assert program.globals == {"count": 10}
+
+
+def test_state_persists_between_calls():
+    program = MicroC.compile(COUNTER)
+    state = program.new_state()
+    assert program.call("bump", 5, state=state) == 15
+    assert program.call("bump", 5, state=state) == 20
+    assert state.values == {"count": 20}
+    assert program.call("bump", 5) == 15
+    assert program.new_state().values == {"count": 10}
+
+
+def test_capture_returns_printed_output():
+    program = MicroC.compile(COUNTER)
+    state = program.new_state()
+    program.call("bump", 2, state=state)
+    assert program.capture("show", state=state) == (12, "12\n")
+    assert program.capture("show") == (10, "10\n")
+
+
+def test_syntax_error_raises_parse_error():
+    with pytest.raises(ParseError):
+        MicroC.compile("int main( {")
+
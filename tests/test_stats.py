@@ -0,0 +1,82 @@
+import json
+
+from MicroC.parser import parse
+from MicroC.stats import Stats, phase
+from MicroC.transformer import MicroCTransformer
+
+SOURCE = """
+    int g = 1;
+    int main() {
+        int x = 2;
+        if (x) { x = 3; }
+        return x;
+    }
+"""
+
+
+def test_phase_without_stats_does_nothing():
+    with phase(None, "parse") as result:
+        assert result is None
+
+
+def test_phase_records_measures():
+    stats = Stats()
+    with phase(stats, "parse"):
+        parse(SOURCE)
+    [parse_stats] = stats.phases
+    assert parse_stats.name == "parse"
+    assert parse_stats.wall_time > 0 and parse_stats.cpu_time >= 0
+    assert parse_stats.peak_memory is None
+
+
+def test_record_program_counts():
+    stats = Stats()
+    stats.record_program(MicroCTransformer().transform(parse(SOURCE)))
+    # Program, VarDecl e Int da global; FunDecl, Block, VarDecl, Int,
+    # IfStmt, Var, Block, ExprStmt, Assign, Int, Return e Var de main
+    assert stats.nodes == 15
+    assert stats.functions == 1
+    assert stats.lazy_functions == 0
+    # escopo global, corpo de main e bloco do if
+    assert stats.max_scope_depth == 3
+
+
+def test_record_program_with_lazy_functions():
+    stats = Stats()
+    stats.record_program(MicroCTransformer().transform_lazy(parse(SOURCE)))
+    assert stats.functions == 1
+    assert stats.lazy_functions == 1
+    assert stats.nodes == 4
+    assert stats.max_scope_depth == 1
+
+
+def test_json_schema():
+    stats = Stats()
+    with stats.phase("parse"):
+        tree = parse(SOURCE)
+    with stats.phase("transform"):
+        program = MicroCTransformer().transform(tree)
+    stats.record_program(program)
+
+    data = json.loads(stats.to_json())
+    assert set(data) == {
+        "memory", "phases", "total_wall_time", "total_cpu_time",
+        "nodes", "functions", "lazy_functions", "max_scope_depth",
+    }
+    assert data["memory"] is False
+    assert [p["name"] for p in data["phases"]] == ["parse", "transform"]
+    for p in data["phases"]:
+        assert set(p) == {"name", "wall_time", "cpu_time", "peak_memory", "objects"}
+        assert p["peak_memory"] is None
+    assert data["total_wall_time"] == sum(p["wall_time"] for p in data["phases"])
+    assert (data["nodes"], data["functions"], data["max_scope_depth"]) == (15, 1, 3)
+
+
+def test_memory_is_measured_only_when_requested():
+    stats = Stats(memory=True)
+    with stats.phase("transform"):
+        MicroCTransformer().transform(parse(SOURCE))
+    data = json.loads(stats.to_json())
+    assert data["memory"] is True
+    assert data["phases"][0]["peak_memory"] > 0
+    assert stats.format().splitlines()[1].split()[3] != "-"